@@ -18,18 +18,21 @@ Architecture:
 import os
 import logging
 import asyncio
+import re
+import time
 from typing import Optional, Dict, List, Any
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import httpx
+import orjson
 
 from azure.identity.aio import DefaultAzureCredential, AzureCliCredential
-from azure.servicebus.aio import ServiceBusClient, ServiceBusReceiver, ServiceBusSender
+from azure.servicebus.aio import AutoLockRenewer, ServiceBusClient, ServiceBusReceiver, ServiceBusSender
 from azure.servicebus import ServiceBusMessage
 
 # Load environment variables
@@ -54,10 +57,82 @@ AGENT_ENDPOINTS = os.getenv(
     "http://travel-agent-service/.well-known/agent.json"
 ).split(",")
 
+# Parsed once at import: (agent card URL, agent base URL)
+ENDPOINTS: List[tuple] = [
+    (url.strip(), url.strip().removesuffix("/.well-known/agent.json"))
+    for url in AGENT_ENDPOINTS
+    if url.strip()
+]
+
+# Task keywords per routing bucket (substring match against the lowercased task)
+BURGER_KW = frozenset({"burger", "cheeseburger", "hamburger"})
+PIZZA_KW = frozenset({"pizza", "pizzas", "margherita", "pepperoni"})
+ILLUSTRATION_KW = frozenset({"illustration", "illustrate", "draw", "image", "picture", "visual", "graphic"})
+CURRENCY_KW = frozenset({"currency", "exchange", "convert"})
+TRAVEL_KW = frozenset({"restaurant", "attraction", "itinerary", "trip", "plan"})
+
+# Routing table, in priority order:
+# (bucket, task keywords, capability needles, agent card fields searched for a needle)
+_ALL_FIELDS = ("name", "description", "skill_name", "skill_description")
+ROUTES = (
+    ("burger", BURGER_KW, ("burger",), _ALL_FIELDS),
+    ("pizza", PIZZA_KW, ("pizza",), _ALL_FIELDS),
+    ("illustration", ILLUSTRATION_KW, ("illustrat",), _ALL_FIELDS),
+    ("currency", CURRENCY_KW, ("currency",), ("skill_name", "skill_description")),
+    ("travel", TRAVEL_KW, ("travel", "restaurant", "attraction"), ("skill_name",)),
+)
+
+# Max concurrent outbound calls to agents (shared by /task and the queue processor)
+MAX_INFLIGHT_AGENT_CALLS = int(os.getenv("MAX_INFLIGHT_AGENT_CALLS", "32"))
+
+# Queue processor: max tasks processed concurrently per received batch
+QUEUE_WORKER_CONCURRENCY = int(os.getenv("QUEUE_WORKER_CONCURRENCY", "8"))
+
+# Queue processor: messages per receive call. Kept near the worker count (and
+# no prefetch) because a message's peek-lock starts as soon as it is received.
+QUEUE_RECEIVE_BATCH_SIZE = int(os.getenv("QUEUE_RECEIVE_BATCH_SIZE", str(QUEUE_WORKER_CONCURRENCY)))
+
+# Queue processor: keep renewing a task's lock (1 min on agent-tasks) for up to this many seconds
+QUEUE_LOCK_RENEWAL_SECONDS = float(os.getenv("QUEUE_LOCK_RENEWAL_SECONDS", "300"))
+
+# Queue processor: responses are batched per received batch and flushed once it is
+# done; while a slow agent call holds the batch open, finished tasks are flushed at
+# most this often (seconds) so their locks and responses aren't held back
+RESPONSE_FLUSH_INTERVAL = 0.5
+
+# Max messages scanned by a single GET /responses/{user_id} call (page further with from_sequence)
+RESPONSES_PEEK_LIMIT = 500
+
+# How long a fetched agent card is reused before re-fetching (seconds)
+AGENT_CARD_CACHE_TTL = float(os.getenv("AGENT_CARD_CACHE_TTL", "60"))
+
 # Global state
 discovered_agents: Dict[str, Dict[str, Any]] = {}
 service_bus_client: Optional[ServiceBusClient] = None
+task_sender: Optional[ServiceBusSender] = None
+http_client: Optional[httpx.AsyncClient] = None
 queue_processor_task: Optional[asyncio.Task] = None
+_agent_card_cache: Dict[str, tuple] = {}  # endpoint_url -> (fetched_at, agent_card)
+_keyword_to_agent: Dict[str, tuple] = {}  # keyword -> (priority, agent_name, bucket)
+_router_regex: Optional[re.Pattern] = None
+_task_sender_lock = asyncio.Lock()
+_agent_call_slots = asyncio.Semaphore(MAX_INFLIGHT_AGENT_CALLS)
+_agents_view_json: bytes = orjson.dumps({"total_agents": 0, "agents": []})
+
+
+async def send_message_batches(sender: ServiceBusSender, messages: List[ServiceBusMessage]):
+    """Send messages using as few size-bounded ServiceBusMessageBatch sends as possible"""
+    batch = await sender.create_message_batch()
+    for message in messages:
+        try:
+            batch.add_message(message)
+        except ValueError:
+            # Batch is full - flush it and start a new one
+            await sender.send_messages(batch)
+            batch = await sender.create_message_batch()
+            batch.add_message(message)
+    if len(batch):
+        await sender.send_messages(batch)
 
 
 async def process_queue_messages():
@@ -72,59 +147,133 @@ async def process_queue_messages():
         async with service_bus_client.get_queue_receiver(
             queue_name="agent-tasks",
             max_wait_time=5
-        ) as receiver:
+        ) as receiver, service_bus_client.get_queue_sender(
+            queue_name="agent-responses"
+        ) as response_sender, AutoLockRenewer(
+            max_lock_renewal_duration=QUEUE_LOCK_RENEWAL_SECONDS
+        ) as lock_renewer:
+            loop = asyncio.get_running_loop()
+            pending_responses: List[ServiceBusMessage] = []
+            pending_completions: List[Any] = []
+            last_flush = loop.time()
+            worker_slots = asyncio.Semaphore(QUEUE_WORKER_CONCURRENCY)
+            flush_lock = asyncio.Lock()
+            receiver_lock = asyncio.Lock()
+            
+            async def settle(action, msg, **kwargs):
+                """Settle one message; receivers are not coroutine-safe, so settlements take turns"""
+                async with receiver_lock:
+                    await action(msg, **kwargs)
+            
+            async def flush():
+                """Send buffered responses, then settle the tasks that produced them"""
+                nonlocal last_flush
+                last_flush = loop.time()
+                if not pending_completions:
+                    return
+                
+                responses = pending_responses[:]
+                completions = pending_completions[:]
+                pending_responses.clear()
+                pending_completions.clear()
+                
+                # Workers may flush concurrently; senders are not coroutine-safe
+                async with flush_lock:
+                    try:
+                        if responses:
+                            await send_message_batches(response_sender, responses)
+                    except Exception as e:
+                        logger.error("❌ Error sending %d queued responses: %s", len(responses), e)
+                        # Release the tasks so they are redelivered
+                        for m in completions:
+                            try:
+                                await settle(receiver.abandon_message, m)
+                            except Exception as abandon_error:
+                                logger.error("❌ Error abandoning message: %s", abandon_error)
+                        return
+                    
+                    # Complete the messages only after their responses are queued
+                    for m in completions:
+                        await settle(receiver.complete_message, m)
+                logger.info("✅ Flushed %d responses, completed %d tasks", len(responses), len(completions))
+            
+            async def handle(msg):
+                """Route one queued task to an agent and buffer its response"""
+                async with worker_slots:
+                    try:
+                        task = str(msg)
+                        user_id = msg.application_properties.get("user_id", "anonymous")
+                        preferred_agent = msg.application_properties.get("preferred_agent")
+                        
+                        logger.info("📨 Processing queued task from %s: %s", user_id, task)
+                        
+                        # Select and call agent
+                        selected_agent = select_best_agent(task, preferred_agent)
+                        if selected_agent:
+                            result = await call_agent(selected_agent, task, user_id)
+                            
+                            # Buffer result for the response queue
+                            pending_responses.append(ServiceBusMessage(
+                                body=result,
+                                application_properties={
+                                    "user_id": user_id,
+                                    "agent_used": selected_agent,
+                                    "original_task": task
+                                }
+                            ))
+                        
+                        # Complete the message once its response is flushed
+                        pending_completions.append(msg)
+                        
+                    except Exception as e:
+                        logger.error("❌ Error processing message: %s", e)
+                        # Dead-letter the message if processing fails
+                        await settle(
+                            receiver.dead_letter_message, msg,
+                            reason="ProcessingError", error_description=str(e)
+                        )
+                
+                if loop.time() - last_flush > RESPONSE_FLUSH_INTERVAL:
+                    await flush()
+            
             while True:
                 try:
                     # Receive messages
-                    received_msgs = await receiver.receive_messages(max_message_count=10, max_wait_time=5)
+                    received_msgs = await receiver.receive_messages(
+                        max_message_count=QUEUE_RECEIVE_BATCH_SIZE,
+                        max_wait_time=1
+                    )
+                    
+                    if not received_msgs:
+                        # Queue is idle - back off briefly before polling again
+                        await asyncio.sleep(0.2)
+                        continue
                     
+                    # Agent calls can outlast the queue's lock duration; renew until settled
                     for msg in received_msgs:
-                        try:
-                            task = str(msg)
-                            user_id = msg.application_properties.get("user_id", "anonymous")
-                            preferred_agent = msg.application_properties.get("preferred_agent")
-                            
-                            logger.info(f"📨 Processing queued task from {user_id}: {task}")
-                            
-                            # Select and call agent
-                            selected_agent = select_best_agent(task, preferred_agent)
-                            if selected_agent:
-                                result = await call_agent(selected_agent, task, user_id)
-                                
-                                # Send result to response queue
-                                async with service_bus_client.get_queue_sender(queue_name="agent-responses") as sender:
-                                    response_msg = ServiceBusMessage(
-                                        body=result,
-                                        application_properties={
-                                            "user_id": user_id,
-                                            "agent_used": selected_agent,
-                                            "original_task": task
-                                        }
-                                    )
-                                    await sender.send_messages(response_msg)
-                                
-                                logger.info(f"✅ Task completed and response queued")
-                            
-                            # Complete the message
-                            await receiver.complete_message(msg)
-                            
-                        except Exception as e:
-                            logger.error(f"❌ Error processing message: {e}", exc_info=True)
-                            # Dead-letter the message if processing fails
-                            await receiver.dead_letter_message(msg, reason="ProcessingError", error_description=str(e))
+                        lock_renewer.register(receiver, msg)
+                    
+                    # Process the batch concurrently, bounded by QUEUE_WORKER_CONCURRENCY
+                    results = await asyncio.gather(
+                        *(handle(msg) for msg in received_msgs),
+                        return_exceptions=True
+                    )
+                    for error in results:
+                        if isinstance(error, Exception):
+                            logger.error("❌ Error in queue worker: %s", error)
                     
-                    # Small delay between batches
-                    await asyncio.sleep(1)
+                    # Don't hold buffered responses while blocked on the next receive
+                    await flush()
                     
                 except asyncio.CancelledError:
                     logger.info("Queue processor cancelled")
                     break
                 except Exception as e:
-                    logger.error(f"❌ Error in queue processor: {e}", exc_info=True)
+                    logger.error("❌ Error in queue processor: %s", e, exc_info=True)
                     await asyncio.sleep(5)
                     
     except Exception as e:
-        logger.error(f"❌ Fatal error in queue processor: {e}", exc_info=True)
+        logger.error("❌ Fatal error in queue processor: %s", e, exc_info=True)
 
 
 class TaskRequest(BaseModel):
@@ -134,6 +283,11 @@ class TaskRequest(BaseModel):
     preferred_agent: Optional[str] = None
 
 
+class TaskBatchRequest(BaseModel):
+    """Request model for queueing several tasks at once"""
+    tasks: List[TaskRequest]
+
+
 class TaskResponse(BaseModel):
     """Response model for orchestrator tasks"""
     result: str
@@ -151,61 +305,154 @@ def get_azure_credential():
     return DefaultAzureCredential()
 
 
-async def discover_agent(endpoint_url: str) -> Optional[Dict[str, Any]]:
+async def discover_agent(endpoint_url: str, force: bool = False) -> Optional[Dict[str, Any]]:
     """
     Discover an agent by fetching its agent card from .well-known/agent.json
     
+    Cards are cached per endpoint for AGENT_CARD_CACHE_TTL seconds.
+    
     Args:
         endpoint_url: URL to the agent's card endpoint
+        force: Bypass the cache and always re-fetch the card
         
     Returns:
         Agent metadata dictionary or None if discovery fails
     """
+    cached = _agent_card_cache.get(endpoint_url)
+    if cached and not force and time.monotonic() - cached[0] < AGENT_CARD_CACHE_TTL:
+        logger.info("♻️  Using cached agent card for %s", endpoint_url)
+        return cached[1]
+    
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(endpoint_url)
-            response.raise_for_status()
-            agent_card = response.json()
-            
-            # Handle both A2A and ADK formats
-            # A2A: capabilities.skills
-            # ADK: skills (at root level)
-            skills = agent_card.get('skills', []) or agent_card.get('capabilities', {}).get('skills', [])
-            
-            logger.info(f"✅ Discovered agent: {agent_card.get('name', 'unknown')}")
-            logger.info(f"   Description: {agent_card.get('description', 'N/A')}")
-            logger.info(f"   Protocol: {agent_card.get('protocolVersion', 'A2A')}")
-            logger.info(f"   Skills: {len(skills)}")
-            
-            return agent_card
-            
+        response = await http_client.get(endpoint_url, timeout=10.0)
+        response.raise_for_status()
+        agent_card = response.json()
+        if not isinstance(agent_card, dict):
+            raise ValueError("agent card is not a JSON object")
+        
+        # Handle both A2A and ADK formats
+        # A2A: capabilities.skills
+        # ADK: skills (at root level)
+        skills = agent_card.get('skills') or _card_skills(agent_card)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✅ Discovered agent: %s", agent_card.get('name', 'unknown'))
+            logger.info("   Description: %s", agent_card.get('description', 'N/A'))
+            logger.info("   Protocol: %s", agent_card.get('protocolVersion', 'A2A'))
+            logger.info("   Skills: %d", len(skills))
+        
+        _agent_card_cache[endpoint_url] = (time.monotonic(), agent_card)
+        return agent_card
+        
     except Exception as e:
-        logger.error(f"❌ Failed to discover agent at {endpoint_url}: {e}")
+        logger.error("❌ Failed to discover agent at %s: %s", endpoint_url, e)
         return None
 
 
-async def discover_all_agents():
-    """Discover all configured agents"""
+async def discover_all_agents(force: bool = False):
+    """Discover all configured agents (force=True bypasses the agent card cache)"""
     global discovered_agents
     
     logger.info("🔍 Starting agent discovery...")
     
-    for endpoint in AGENT_ENDPOINTS:
-        endpoint = endpoint.strip()
-        if not endpoint:
+    # Fetch all agent cards concurrently
+    results = await asyncio.gather(
+        *(discover_agent(endpoint, force=force) for endpoint, _ in ENDPOINTS),
+        return_exceptions=True
+    )
+    
+    for (endpoint, base_url), agent_card in zip(ENDPOINTS, results):
+        if isinstance(agent_card, BaseException):
+            logger.error("❌ Failed to discover agent at %s: %s", endpoint, agent_card)
             continue
-            
-        agent_card = await discover_agent(endpoint)
         if agent_card:
             agent_name = agent_card.get("name", "unknown")
             # Store both the agent card and its base URL
             agent_card["_discovery_url"] = endpoint
-            agent_card["_base_url"] = endpoint.replace("/.well-known/agent.json", "")
+            agent_card["_base_url"] = base_url
             discovered_agents[agent_name] = agent_card
     
-    logger.info(f"✅ Discovery complete. Found {len(discovered_agents)} agents:")
+    build_routing_table()
+    build_agents_view()
+    
+    logger.info("✅ Discovery complete. Found %d agents:", len(discovered_agents))
     for agent_name in discovered_agents.keys():
-        logger.info(f"   - {agent_name}")
+        logger.info("   - %s", agent_name)
+
+
+def _card_skills(agent_card: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the card's capabilities.skills, tolerating null or malformed entries"""
+    capabilities = agent_card.get("capabilities")
+    skills = capabilities.get("skills") if isinstance(capabilities, dict) else None
+    return [skill for skill in skills or [] if isinstance(skill, dict)]
+
+
+def _agent_routing_buckets(agent_name: str, agent_card: Dict[str, Any]) -> List[str]:
+    """Return the ROUTES buckets an agent can serve, based on its card"""
+    skills = _card_skills(agent_card)
+    fields = {
+        "name": [str(agent_name).lower()],
+        "description": [str(agent_card.get("description") or "").lower()],
+        "skill_name": [str(skill.get("name") or "").lower() for skill in skills],
+        "skill_description": [str(skill.get("description") or "").lower() for skill in skills],
+    }
+    
+    return [
+        bucket
+        for bucket, _, needles, searched in ROUTES
+        if any(needle in text for field in searched for text in fields[field] for needle in needles)
+    ]
+
+
+def build_routing_table():
+    """
+    Precompute the keyword -> agent routing table from the discovered agents
+    
+    Each task keyword maps to the first discovered agent able to serve its bucket,
+    so routing a task only needs a single regex scan instead of re-walking every
+    agent card and skill.
+    """
+    global _keyword_to_agent, _router_regex
+    
+    keyword_to_agent: Dict[str, tuple] = {}
+    keywords_by_bucket = {bucket: keywords for bucket, keywords, _, _ in ROUTES}
+    for priority, (agent_name, agent_card) in enumerate(discovered_agents.items()):
+        for bucket in _agent_routing_buckets(agent_name, agent_card):
+            for keyword in keywords_by_bucket[bucket]:
+                keyword_to_agent.setdefault(keyword, (priority, agent_name, bucket))
+    
+    _keyword_to_agent = keyword_to_agent
+    if keyword_to_agent:
+        # Longest keywords first so e.g. "cheeseburger" wins over "burger"
+        keywords = sorted(keyword_to_agent, key=len, reverse=True)
+        _router_regex = re.compile("|".join(map(re.escape, keywords)))
+    else:
+        _router_regex = None
+
+
+def build_agents_view():
+    """Pre-serialize the GET /agents payload from the discovered agents"""
+    global _agents_view_json
+    
+    agents_info = []
+    
+    for agent_name, agent_card in discovered_agents.items():
+        agents_info.append({
+            "name": agent_name,
+            "description": agent_card.get("description") or "",
+            "skills": [
+                {
+                    "name": skill.get("name"),
+                    "description": skill.get("description")
+                }
+                for skill in _card_skills(agent_card)
+            ]
+        })
+    
+    _agents_view_json = orjson.dumps({
+        "total_agents": len(agents_info),
+        "agents": agents_info
+    })
 
 
 def select_best_agent(task: str, preferred_agent: Optional[str] = None) -> Optional[str]:
@@ -220,78 +467,22 @@ def select_best_agent(task: str, preferred_agent: Optional[str] = None) -> Optio
         Agent name or None if no suitable agent found
     """
     if preferred_agent and preferred_agent in discovered_agents:
-        logger.info(f"Using preferred agent: {preferred_agent}")
+        logger.info("Using preferred agent: %s", preferred_agent)
         return preferred_agent
     
-    # Simple keyword matching for demo
+    # Simple keyword matching for demo, using the table built at discovery time
     # In production, use LLM-based routing or semantic similarity
-    task_lower = task.lower()
-    
-    for agent_name, agent_card in discovered_agents.items():
-        # Get agent metadata for matching
-        agent_description = agent_card.get("description", "").lower()
-        agent_name_lower = agent_name.lower()
-        capabilities = agent_card.get("capabilities", {})
-        skills = capabilities.get("skills", [])
-        
-        # Match by keywords - Burger Orders (check agent name and description first)
-        if any(keyword in task_lower for keyword in ["burger", "cheeseburger", "hamburger"]):
-            if "burger" in agent_name_lower or "burger" in agent_description:
-                logger.info(f"Selected {agent_name} based on burger keyword in name/description")
-                return agent_name
-        
-        # Match by keywords - Pizza Orders (check agent name and description first)
-        if any(keyword in task_lower for keyword in ["pizza", "pizzas", "margherita", "pepperoni"]):
-            if "pizza" in agent_name_lower or "pizza" in agent_description:
-                logger.info(f"Selected {agent_name} based on pizza keyword in name/description")
-                return agent_name
-        
-        # Match by keywords - Illustration agent (check name and description too)
-        if any(keyword in task_lower for keyword in ["illustration", "illustrate", "draw", "image", "picture", "visual", "graphic"]):
-            if "illustrat" in agent_name_lower or "illustrat" in agent_description:
-                logger.info(f"Selected {agent_name} based on illustration keyword in name/description")
-                return agent_name
-        
-        # Check if task matches agent skills
-        for skill in skills:
-            skill_name = skill.get("name", "").lower()
-            skill_desc = skill.get("description", "").lower()
-            examples = skill.get("examples", [])
-            
-            # Match by keywords - Illustration agent (in skills)
-            if any(keyword in task_lower for keyword in ["illustration", "illustrate", "draw", "image", "picture", "visual", "graphic"]):
-                if "illustrat" in skill_name or "illustrat" in skill_desc:
-                    logger.info(f"Selected {agent_name} based on illustration skill match")
-                    return agent_name
-            
-            # Match by keywords - Currency/Exchange
-            if any(keyword in task_lower for keyword in ["currency", "exchange", "convert"]):
-                if "currency" in skill_name or "currency" in skill_desc:
-                    logger.info(f"Selected {agent_name} based on currency skill match")
-                    return agent_name
-            
-            # Match by keywords - Travel/Activity
-            if any(keyword in task_lower for keyword in ["restaurant", "attraction", "itinerary", "trip", "plan"]):
-                if "travel" in skill_name or "restaurant" in skill_name or "attraction" in skill_name:
-                    logger.info(f"Selected {agent_name} based on travel/activity skill match")
-                    return agent_name
-            
-            # Match by keywords - Burger Orders
-            if any(keyword in task_lower for keyword in ["burger", "cheeseburger", "hamburger"]):
-                if "burger" in skill_name or "burger" in skill_desc or "burger" in agent_name.lower():
-                    logger.info(f"Selected {agent_name} based on burger order skill match")
-                    return agent_name
-            
-            # Match by keywords - Pizza Orders
-            if any(keyword in task_lower for keyword in ["pizza", "pizzas", "margherita", "pepperoni"]):
-                if "pizza" in skill_name or "pizza" in skill_desc or "pizza" in agent_name.lower():
-                    logger.info(f"Selected {agent_name} based on pizza order skill match")
-                    return agent_name
+    if _router_regex:
+        matches = [_keyword_to_agent[m.group(0)] for m in _router_regex.finditer(task.lower())]
+        if matches:
+            _, agent_name, bucket = min(matches)
+            logger.info("Selected %s based on %s keyword match", agent_name, bucket)
+            return agent_name
     
     # Default to first available agent if no specific match
     if discovered_agents:
         default_agent = list(discovered_agents.keys())[0]
-        logger.info(f"No specific match found, using default agent: {default_agent}")
+        logger.info("No specific match found, using default agent: %s", default_agent)
         return default_agent
     
     logger.warning("No agents available")
@@ -322,7 +513,7 @@ async def call_agent(agent_name: str, task: str, user_id: str) -> str:
     if not agent_base_url:
         raise ValueError(f"No base URL stored for agent '{agent_name}'")
     
-    logger.info(f"Using discovery base URL: {agent_base_url}")
+    logger.info("Using discovery base URL: %s", agent_base_url)
     
     # Construct task URL
     # For GCP agents: base_url already includes the full path (e.g., /a2a/illustration_agent)
@@ -330,27 +521,44 @@ async def call_agent(agent_name: str, task: str, user_id: str) -> str:
     # Try /task endpoint (standard for both)
     task_url = f"{agent_base_url}/task"
     
-    logger.info(f"📞 Calling {agent_name} at {task_url}")
+    logger.info("📞 Calling %s at %s", agent_name, task_url)
     
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
+        # Bound in-flight agent calls so a slow agent can't pin unlimited sockets
+        async with _agent_call_slots:
+            response = await http_client.post(
                 task_url,
                 json={"task": task, "user_id": user_id}
             )
-            response.raise_for_status()
-            result = response.json()
-            
-            return result.get("result", str(result))
-            
+        response.raise_for_status()
+        result = response.json()
+        
+        return result.get("result", str(result))
+        
     except Exception as e:
-        logger.error(f"❌ Error calling {agent_name}: {e}")
+        logger.error("❌ Error calling %s: %s", agent_name, e)
         raise HTTPException(status_code=500, detail=f"Failed to call agent: {str(e)}")
 
 
+def create_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client used for all outbound A2A calls"""
+    # Pool limits live on the transport; the client ignores `limits` when a transport is given.
+    # HTTP/2 multiplexes concurrent requests to the same HTTPS host over one connection.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=1,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(120.0, connect=5.0),
+        transport=transport,
+        trust_env=False  # No proxy/netrc environment lookups needed inside the cluster
+    )
+
+
 async def setup_service_bus():
     """Setup Azure Service Bus client for async communication"""
-    global service_bus_client
+    global service_bus_client, task_sender
     
     if not SERVICEBUS_NAMESPACE:
         logger.warning("⚠️  Service Bus namespace not configured, skipping setup")
@@ -365,20 +573,30 @@ async def setup_service_bus():
             credential=credential
         )
         
+        # Long-lived sender for /task/async (avoids an AMQP link per request);
+        # the link opens lazily on the first send and is closed on shutdown
+        task_sender = service_bus_client.get_queue_sender(queue_name="agent-tasks")
+        
         logger.info(f"✅ Connected to Service Bus: {fully_qualified_namespace}")
         
     except Exception as e:
         logger.error(f"❌ Failed to setup Service Bus: {e}")
+        if service_bus_client:
+            await service_bus_client.close()
         service_bus_client = None
+        task_sender = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - initialize on startup"""
-    global queue_processor_task
+    global queue_processor_task, http_client
     
     logger.info("🚀 Starting Orchestrator Agent...")
     
+    # Shared HTTP client (connection pooling / keep-alive for A2A calls)
+    http_client = create_http_client()
+    
     # Discover agents
     await discover_all_agents()
     
@@ -401,8 +619,14 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     
+    if task_sender:
+        await task_sender.close()
+    
     if service_bus_client:
         await service_bus_client.close()
+    
+    if http_client:
+        await http_client.aclose()
 
 
 # FastAPI app
@@ -410,7 +634,8 @@ app = FastAPI(
     title="Orchestrator Agent",
     description="A2A Protocol Orchestrator for Multi-Agent System",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
@@ -438,26 +663,8 @@ async def health():
 
 @app.get("/agents")
 async def list_agents():
-    """List all discovered agents and their capabilities"""
-    agents_info = []
-    
-    for agent_name, agent_card in discovered_agents.items():
-        agents_info.append({
-            "name": agent_name,
-            "description": agent_card.get("description", ""),
-            "skills": [
-                {
-                    "name": skill.get("name"),
-                    "description": skill.get("description")
-                }
-                for skill in agent_card.get("capabilities", {}).get("skills", [])
-            ]
-        })
-    
-    return {
-        "total_agents": len(agents_info),
-        "agents": agents_info
-    }
+    """List all discovered agents and their capabilities (pre-serialized at discovery time)"""
+    return Response(content=_agents_view_json, media_type="application/json")
 
 
 @app.post("/task", response_model=TaskResponse)
@@ -471,7 +678,7 @@ async def execute_task(request: TaskRequest):
     3. Routes the request to that agent
     4. Returns the result
     """
-    logger.info(f"📝 New task from {request.user_id}: {request.task}")
+    logger.info("📝 New task from %s: %s", request.user_id, request.task)
     
     if not discovered_agents:
         raise HTTPException(
@@ -492,7 +699,7 @@ async def execute_task(request: TaskRequest):
     try:
         result = await call_agent(selected_agent, request.task, request.user_id)
         
-        logger.info(f"✅ Task completed by {selected_agent}")
+        logger.info("✅ Task completed by %s", selected_agent)
         
         return TaskResponse(
             result=result,
@@ -521,22 +728,23 @@ async def execute_task_async(request: TaskRequest):
             detail="Service Bus not available. Use /task for synchronous execution."
         )
     
-    logger.info(f"📬 Queueing task from {request.user_id}: {request.task}")
+    logger.info("📬 Queueing task from %s: %s", request.user_id, request.task)
     
     try:
         # Send message to Service Bus queue
-        async with service_bus_client.get_queue_sender(queue_name="agent-tasks") as sender:
-            message = ServiceBusMessage(
-                body=request.task,
-                application_properties={
-                    "user_id": request.user_id,
-                    "preferred_agent": request.preferred_agent or ""
-                }
-            )
-            await sender.send_messages(message)
-            message_id = message.message_id
+        message = ServiceBusMessage(
+            body=request.task,
+            application_properties={
+                "user_id": request.user_id,
+                "preferred_agent": request.preferred_agent or ""
+            }
+        )
+        # Senders are not coroutine-safe, so requests take turns on the shared one
+        async with _task_sender_lock:
+            await task_sender.send_messages(message)
+        message_id = message.message_id
         
-        logger.info(f"✅ Task queued successfully: {message_id}")
+        logger.info("✅ Task queued successfully: %s", message_id)
         
         return {
             "status": "queued",
@@ -550,10 +758,56 @@ async def execute_task_async(request: TaskRequest):
         raise HTTPException(status_code=500, detail=f"Failed to queue task: {str(e)}")
 
 
+@app.post("/task/async/batch")
+async def execute_task_async_batch(request: TaskBatchRequest):
+    """
+    Queue several tasks for async processing via Service Bus in one call
+    
+    Tasks are packed into size-bounded ServiceBusMessageBatch sends, so a
+    large submission is split only when a batch reaches the tier size limit.
+    """
+    if not service_bus_client:
+        raise HTTPException(
+            status_code=503,
+            detail="Service Bus not available. Use /task for synchronous execution."
+        )
+    
+    logger.info("📬 Queueing batch of %d tasks", len(request.tasks))
+    
+    try:
+        messages = [
+            ServiceBusMessage(
+                body=task.task,
+                application_properties={
+                    "user_id": task.user_id,
+                    "preferred_agent": task.preferred_agent or ""
+                }
+            )
+            for task in request.tasks
+        ]
+        
+        async with _task_sender_lock:
+            await send_message_batches(task_sender, messages)
+        
+        message_ids = [message.message_id for message in messages]
+        logger.info("✅ Queued %d tasks", len(message_ids))
+        
+        return {
+            "status": "queued",
+            "message_ids": message_ids,
+            "queue": "agent-tasks",
+            "message": f"{len(message_ids)} tasks queued for async processing"
+        }
+        
+    except Exception as e:
+        logger.error("❌ Error queuing task batch: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to queue tasks: {str(e)}")
+
+
 @app.post("/discover")
-async def trigger_discovery():
-    """Manually trigger agent discovery"""
-    await discover_all_agents()
+async def trigger_discovery(force: bool = False):
+    """Manually trigger agent discovery (?force=true re-fetches all agent cards)"""
+    await discover_all_agents(force=force)
     return {
         "status": "discovery_complete",
         "agents_found": len(discovered_agents),
@@ -562,15 +816,22 @@ async def trigger_discovery():
 
 
 @app.get("/responses/{user_id}")
-async def get_responses(user_id: str, max_messages: int = 10):
+async def get_responses(user_id: str, max_messages: int = 10, from_sequence: int = 0):
     """
     Fetch async responses for a specific user from Service Bus queue
     
     This endpoint:
     1. Connects to the agent-responses queue
-    2. Peeks at messages (without removing them)
+    2. Peeks at messages (without removing them, so other users' responses are untouched)
     3. Filters by user_id
     4. Returns the responses
+    
+    Peeking never removes responses; they are dropped when the queue's message TTL
+    (P1D) expires, which requires deadLetteringOnMessageExpiration to stay disabled
+    on agent-responses so they don't accumulate in the dead-letter queue. A single
+    call scans at most RESPONSES_PEEK_LIMIT messages starting at `from_sequence`.
+    Pass the returned `next_sequence` as `from_sequence` to continue with newer
+    messages; `more_available` is true when the scan stopped before the end of the queue.
     """
     if not service_bus_client:
         raise HTTPException(
@@ -580,16 +841,30 @@ async def get_responses(user_id: str, max_messages: int = 10):
     
     try:
         responses = []
+        page_size = max_messages if user_id == "all" else max_messages * 4
+        scanned = 0
+        next_sequence = from_sequence
+        more_available = False
         
         async with service_bus_client.get_queue_receiver(
-            queue_name="agent-responses",
-            max_wait_time=5
+            queue_name="agent-responses"
         ) as receiver:
-            # Receive messages (peek and delete)
-            async for message in receiver:
-                try:
-                    # Get message body
-                    body = str(message)
+            # Peek pages of messages (read-only, no settlement round-trips)
+            while len(responses) < max_messages:
+                if scanned >= RESPONSES_PEEK_LIMIT:
+                    more_available = True
+                    break
+                
+                messages = await receiver.peek_messages(
+                    max_message_count=min(page_size, RESPONSES_PEEK_LIMIT - scanned),
+                    sequence_number=next_sequence
+                )
+                if not messages:
+                    break
+                
+                for message in messages:
+                    scanned += 1
+                    next_sequence = message.sequence_number + 1
                     
                     # Get properties
                     props = message.application_properties or {}
@@ -599,27 +874,23 @@ async def get_responses(user_id: str, max_messages: int = 10):
                     if user_id == "all" or msg_user_id == user_id:
                         responses.append({
                             "user_id": msg_user_id,
-                            "response": body,
+                            "response": str(message),
                             "agent_used": props.get("agent_used", "unknown"),
                             "timestamp": str(message.enqueued_time_utc) if message.enqueued_time_utc else "N/A",
-                            "message_id": message.message_id
+                            "message_id": message.message_id,
+                            "sequence_number": message.sequence_number
                         })
-                    
-                    # Complete the message (remove from queue)
-                    await receiver.complete_message(message)
-                    
-                    if len(responses) >= max_messages:
-                        break
-                        
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    await receiver.abandon_message(message)
-                    continue
+                        if len(responses) >= max_messages:
+                            # Stopped mid-page; later messages may still match
+                            more_available = True
+                            break
         
         return {
             "total": len(responses),
             "user_id": user_id,
-            "responses": responses
+            "responses": responses,
+            "next_sequence": next_sequence,
+            "more_available": more_available
         }
         
     except Exception as e:
@@ -634,7 +905,7 @@ async def agent_card():
     
     The orchestrator exposes its own agent card for discovery by other systems
     """
-    return JSONResponse({
+    return {
         "name": "orchestrator",
         "description": "Multi-agent orchestrator that discovers and coordinates specialized agents using A2A protocol",
         "version": "1.0.0",
@@ -700,16 +971,22 @@ async def agent_card():
             "author": "MAF Team",
             "repository": "https://github.com/darkanita/MultiAgent-AKS-MAF"
         }
-    })
+    }
 
 
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info(f"🌐 Starting Orchestrator on port {ORCHESTRATOR_PORT}")
+    # Each worker is a separate process with its own event loop, discovery state,
+    # agent card cache and queue processor. Defaults to 1 because os.cpu_count()
+    # reports the node's cores, not the pod's CPU limit.
+    workers = int(os.getenv("WORKERS", "1"))
+    
+    logger.info(f"🌐 Starting Orchestrator on port {ORCHESTRATOR_PORT} with {workers} worker(s)")
     uvicorn.run(
-        app,
+        "main:app",
         host="0.0.0.0",
         port=ORCHESTRATOR_PORT,
+        workers=workers,
         log_level="info"
     )
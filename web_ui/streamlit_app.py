@@ -1,91 +1,25 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from datetime import datetime
-import time
 import os
-import ast
+import re
+import html
+
+# orjson is optional - fall back to the stdlib parser if it isn't installed.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 # Configuration - use environment variable or default
 ORCHESTRATOR_URL = os.getenv("ORCHESTRATOR_URL", "http://4.150.144.45")
 
-def parse_agent_response(result_str, agent_name):
-    """
-    Parse agent response and extract clean text based on agent type
-    
-    Args:
-        result_str: The result string from the orchestrator (can be string or dict)
-        agent_name: Name of the agent that processed the task
-        
-    Returns:
-        Formatted string for display
-    """
-    # For travel agent and other simple responses, return as-is if it's a string
-    if "burger" not in agent_name.lower() and "pizza" not in agent_name.lower():
-        if isinstance(result_str, str):
-            return result_str
-        return str(result_str)
-    
-    # For burger/pizza agents (A2A SDK format), parse the nested structure
-    try:
-        result_dict = None
-        
-        # Handle if it's already a dict
-        if isinstance(result_str, dict):
-            result_dict = result_str
-        # Handle if it's a string representation of a dict
-        elif isinstance(result_str, str):
-            # First, try to evaluate it as Python literal
-            try:
-                result_dict = ast.literal_eval(result_str)
-            except:
-                # If that fails, try JSON parsing with quote replacement
-                try:
-                    json_str = result_str.replace("'", '"')
-                    result_dict = json.loads(json_str)
-                except:
-                    # Return original if we can't parse
-                    return result_str
-        
-        # Now extract the text from the parsed dict
-        if result_dict:
-            # Path: result -> result -> artifacts -> [0] -> parts -> [0] -> text
-            if 'result' in result_dict:
-                inner_result = result_dict['result']
-                
-                if isinstance(inner_result, dict) and 'result' in inner_result:
-                    task_result = inner_result['result']
-                    
-                    if isinstance(task_result, dict) and 'artifacts' in task_result:
-                        artifacts = task_result['artifacts']
-                        
-                        if isinstance(artifacts, list) and len(artifacts) > 0:
-                            artifact = artifacts[0]
-                            
-                            if isinstance(artifact, dict) and 'parts' in artifact:
-                                parts = artifact['parts']
-                                
-                                if isinstance(parts, list) and len(parts) > 0:
-                                    part = parts[0]
-                                    
-                                    if isinstance(part, dict) and 'text' in part:
-                                        return part['text']
-        
-        # If we couldn't extract text, return the original
-        return str(result_str)
-        
-    except Exception as e:
-        # If any error occurs, return the original string
-        return str(result_str)
-
-st.set_page_config(
-    page_title="Multi-Agent Orchestrator",
-    page_icon="🤖",
-    layout="wide"
-)
-
-# Custom CSS
-st.markdown("""
+# Static page content
+CUSTOM_CSS = """
     <style>
     .agent-card {
         padding: 1rem;
@@ -108,6 +42,14 @@ st.markdown("""
         border: 1px solid #c3e6cb;
         margin: 1rem 0;
     }
+    .card-meta {
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        gap: 0.25rem 1rem;
+        font-size: 0.875rem;
+        color: #6c757d;
+        margin-bottom: 0.5rem;
+    }
     .error-box {
         padding: 1rem;
         border-radius: 0.5rem;
@@ -116,7 +58,220 @@ st.markdown("""
         margin: 1rem 0;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Quick test and follow-up buttons: (label, task)
+QUICK_TASKS = (
+    ("🍔 Order Burgers", "I want 2 classic cheeseburgers"),
+    ("🍕 Order Pizza", "Order 1 pepperoni pizza"),
+    ("💱 Convert Currency", "Convert 100 USD to EUR"),
+    ("✈️ Plan Trip", "Plan a 3-day trip to Paris"),
+)
+
+TRAVEL_FOLLOWUPS = (
+    ("🏨 Find Hotels", "Find affordable hotels in Paris"),
+    ("🍽️ Restaurant Recommendations", "Recommend restaurants in Tokyo"),
+    ("🎭 Tourist Attractions", "What are the top attractions in Rome?"),
+)
+
+FOOD_FOLLOWUPS = (
+    ("🍔 More Burgers", "Add 3 bacon burgers to my order"),
+    ("🍕 More Pizza", "Order 2 margherita pizzas"),
+    ("🥤 Add Drinks", "Can I add drinks to my order?"),
+)
+
+# last_agent_type values grouped by follow-up buttons
+TRIP_TYPES = frozenset(("travel", "currency", "trip"))
+FOOD_TYPES = frozenset(("burger", "pizza"))
+
+# last_agent_type -> follow-up buttons
+FOLLOWUP_MAP = {
+    **dict.fromkeys(TRIP_TYPES, TRAVEL_FOLLOWUPS),
+    **dict.fromkeys(FOOD_TYPES, FOOD_FOLLOWUPS),
+}
+
+# Agent type from the agent name, and currency intent from the task text
+AGENT_TYPE_RE = re.compile(r"(burger|pizza|travel)", re.IGNORECASE)
+CURRENCY_RE = re.compile(r"convert|exchange|usd|eur", re.IGNORECASE)
+FOOD_ICONS = {"burger": "🍔", "pizza": "🍕"}
+
+SAMPLE_RESPONSE = {
+    "task_id": "abc123",
+    "user_id": "streamlit-user",
+    "result": "100 USD is approximately 86.42 EUR",
+    "timestamp": "2025-01-01T12:00:00",
+    "agent_used": "travel_agent"
+}
+
+@st.cache_resource
+def get_session():
+    """
+    Shared HTTP session for orchestrator calls
+    
+    Cached across reruns so keep-alive connections to the orchestrator are reused
+    instead of opening a new TCP connection on every interaction.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False  # Hand back the last response so the page can show it
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def parse_body(content):
+    """
+    Parse a JSON response body, memoized on the body bytes
+    
+    Identical bodies (e.g. repeated /responses fetches while the queue hasn't
+    changed) are parsed once. The result is shared, so callers must not mutate it.
+    """
+    return json_loads(content)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_agents(url):
+    """Fetch the orchestrator's discovered agents (cached for 30s per orchestrator URL)"""
+    response = get_session().get(f"{url}/agents", timeout=(1.0, 4.0))
+    response.raise_for_status()
+    return parse_body(response.content)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def render_agent_card(agent_json):
+    """
+    Render a discovered agent (description, skills, URLs) as a single HTML block
+    
+    Keyed on the agent's JSON serialization, so the HTML is rebuilt only when the
+    agent card changes or the cache expires.
+    """
+    agent = json_loads(agent_json)
+    esc = html.escape
+    
+    parts = [f"<div class='agent-card'><p><strong>Description:</strong> {esc(agent.get('description', 'No description'))}</p>"]
+    
+    skills = agent.get('skills', [])
+    if skills:
+        items = "".join(
+            f"<li><strong>{esc(str(skill.get('name', 'Unnamed Skill')))}</strong>: "
+            f"{esc(str(skill.get('description', 'No description')))}</li>"
+            for skill in skills
+        )
+        parts.append(f"<p><strong>Skills:</strong></p><ul>{items}</ul>")
+    
+    # Show agent metadata
+    meta = []
+    if '_discovery_url' in agent:
+        meta.append(f"<span>🔗 Discovery: {esc(agent['_discovery_url'])}</span>")
+    if '_base_url' in agent:
+        meta.append(f"<span>🌐 Base URL: {esc(agent['_base_url'])}</span>")
+    if meta:
+        parts.append(f"<div class='card-meta'>{''.join(meta)}</div>")
+    
+    parts.append("</div>")
+    return "".join(parts)
+
+def render_response_meta(user, agent, timestamp, message_id):
+    """Render one async response's metadata as a single HTML block"""
+    user, agent, timestamp, message_id = (
+        html.escape(str(value)) for value in (user, agent, timestamp, message_id)
+    )
+    return (
+        "<div class='card-meta'>"
+        f"<span>👤 User: {user}</span><span>🤖 Agent: {agent}</span>"
+        f"<span>🕐 Time: {timestamp}</span><span>🆔 Message: {message_id}</span>"
+        "</div>"
+        "<strong>Response:</strong>"
+    )
+
+def _extract_a2a_text(result_dict):
+    """Return result -> result -> artifacts[0] -> parts[0] -> text, or None if the path is missing"""
+    try:
+        return result_dict["result"]["result"]["artifacts"][0]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+def parse_agent_response(result_str, agent_name):
+    """
+    Parse agent response and extract clean text based on agent type
+    
+    Args:
+        result_str: The result string from the orchestrator (can be string or dict)
+        agent_name: Name of the agent that processed the task
+        
+    Returns:
+        Formatted string for display
+    """
+    name_lc = agent_name.lower()
+    
+    # Dicts aren't hashable, so they skip the parse cache
+    if isinstance(result_str, dict):
+        if "burger" not in name_lc and "pizza" not in name_lc:
+            return str(result_str)
+        text = _extract_a2a_text(result_str)
+        return text if text is not None else str(result_str)
+    
+    return _parse_response_str(str(result_str), name_lc)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _parse_response_str(result_str, agent_name):
+    """
+    Cached string branch of parse_agent_response
+    
+    Streamlit re-runs the script on every interaction, so the same response is
+    re-parsed repeatedly; st.cache_data keeps results across reruns.
+    agent_name is expected lowercased.
+    """
+    # For travel agent and other simple responses, return as-is
+    if "burger" not in agent_name and "pizza" not in agent_name:
+        return result_str
+    
+    # For burger/pizza agents (A2A SDK format), parse the nested structure
+    text = result_str.lstrip()
+    if not text:
+        return result_str
+    
+    result_dict = None
+    if text[0] == "{":
+        # JSON object (A2A SDK), possibly pretty-printed, or a Python dict repr
+        # with single quotes swapped
+        for candidate in (text, text.replace("'", '"')):
+            try:
+                result_dict = json_loads(candidate)
+                break
+            except json.JSONDecodeError:
+                result_dict = None
+    
+    if result_dict is None and text[0] in "{[(":
+        # Python literal (repr of a dict) that isn't valid JSON - rare, so import lazily
+        import ast
+        try:
+            result_dict = ast.literal_eval(text)
+        except (ValueError, SyntaxError, TypeError):
+            # Return original if we can't parse
+            return result_str
+    
+    # Now extract the text from the parsed dict
+    extracted = _extract_a2a_text(result_dict) if result_dict else None
+    
+    # If we couldn't extract text, return the original
+    return extracted if extracted is not None else result_str
+
+st.set_page_config(
+    page_title="Multi-Agent Orchestrator",
+    page_icon="🤖",
+    layout="wide"
+)
+
+# Custom CSS (must be emitted on every run - Streamlit drops elements a rerun doesn't re-create)
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Sidebar
 with st.sidebar:
@@ -138,41 +293,23 @@ if page == "🏠 Dashboard":
     col1, col2 = st.columns([3, 1])
     with col2:
         if st.button("🔄 Refresh Agents", use_container_width=True):
+            fetch_agents.clear()
             st.rerun()
     
     try:
-        response = requests.get(f"{orchestrator_url}/agents", timeout=5)
-        if response.status_code == 200:
-            agents_data = response.json()
-            total_agents = agents_data.get("total_agents", 0)
-            agents = agents_data.get("agents", [])
-            
-            st.success(f"✅ Found {total_agents} active agent(s)")
-            
-            # Display agents
-            for agent in agents:
-                with st.expander(f"🤖 {agent['name']}", expanded=True):
-                    st.markdown(f"**Description:** {agent.get('description', 'No description')}")
-                    
-                    skills = agent.get('skills', [])
-                    if skills:
-                        st.markdown("**Skills:**")
-                        for skill in skills:
-                            skill_name = skill.get('name', 'Unnamed Skill')
-                            skill_desc = skill.get('description', 'No description')
-                            st.markdown(f"- **{skill_name}**: {skill_desc}")
-                    
-                    # Show agent metadata
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        if '_discovery_url' in agent:
-                            st.caption(f"🔗 Discovery: {agent['_discovery_url']}")
-                    with col_b:
-                        if '_base_url' in agent:
-                            st.caption(f"🌐 Base URL: {agent['_base_url']}")
-        else:
-            st.error(f"❌ Failed to fetch agents: {response.status_code}")
-            st.code(response.text)
+        agents_data = fetch_agents(orchestrator_url)
+        total_agents = agents_data.get("total_agents", 0)
+        agents = agents_data.get("agents", [])
+        
+        st.success(f"✅ Found {total_agents} active agent(s)")
+        
+        # Display agents
+        for agent in agents:
+            with st.expander(f"🤖 {agent['name']}", expanded=True):
+                st.markdown(render_agent_card(json.dumps(agent, sort_keys=True)), unsafe_allow_html=True)
+    except requests.HTTPError as e:
+        st.error(f"❌ Failed to fetch agents: {e.response.status_code}")
+        st.code(e.response.text)
     except Exception as e:
         st.error(f"❌ Error connecting to orchestrator: {str(e)}")
 
@@ -181,75 +318,32 @@ elif page == "📝 Submit Task":
     
     # Quick test buttons
     st.markdown("### 🚀 Quick Test Buttons")
-    col_q1, col_q2, col_q3, col_q4 = st.columns(4)
-    
-    quick_task = None
-    with col_q1:
-        if st.button("🍔 Order Burgers", use_container_width=True):
-            quick_task = "I want 2 classic cheeseburgers"
-    with col_q2:
-        if st.button("🍕 Order Pizza", use_container_width=True):
-            quick_task = "Order 1 pepperoni pizza"
-    with col_q3:
-        if st.button("💱 Convert Currency", use_container_width=True):
-            quick_task = "Convert 100 USD to EUR"
-    with col_q4:
-        if st.button("✈️ Plan Trip", use_container_width=True):
-            quick_task = "Plan a 3-day trip to Paris"
+    # Buttons render before the text area, so writing its session_state key
+    # pre-fills it on this same run without an extra st.rerun()
+    for col, (label, task) in zip(st.columns(len(QUICK_TASKS)), QUICK_TASKS):
+        if col.button(label, use_container_width=True):
+            st.session_state["task_description"] = task
     
     st.markdown("---")
     
     # Follow-up question buttons (shown after initial response)
-    if "show_followups" in st.session_state and st.session_state.show_followups:
+    if st.session_state.get("show_followups"):
         st.markdown("### 💬 Follow-up Questions")
         
-        followup_task = None
-        
-        # Currency & Travel follow-ups
-        if st.session_state.get("last_agent_type") in ["travel", "currency", "trip"]:
-            col_f1, col_f2, col_f3 = st.columns(3)
-            with col_f1:
-                if st.button("🏨 Find Hotels", use_container_width=True):
-                    followup_task = "Find affordable hotels in Paris"
-            with col_f2:
-                if st.button("🍽️ Restaurant Recommendations", use_container_width=True):
-                    followup_task = "Recommend restaurants in Tokyo"
-            with col_f3:
-                if st.button("🎭 Tourist Attractions", use_container_width=True):
-                    followup_task = "What are the top attractions in Rome?"
-        
-        # Food order follow-ups
-        elif st.session_state.get("last_agent_type") in ["burger", "pizza"]:
-            col_f1, col_f2, col_f3 = st.columns(3)
-            with col_f1:
-                if st.button("🍔 More Burgers", use_container_width=True):
-                    followup_task = "Add 3 bacon burgers to my order"
-            with col_f2:
-                if st.button("🍕 More Pizza", use_container_width=True):
-                    followup_task = "Order 2 margherita pizzas"
-            with col_f3:
-                if st.button("🥤 Add Drinks", use_container_width=True):
-                    followup_task = "Can I add drinks to my order?"
-        
-        if followup_task:
-            st.session_state.task_input_value = followup_task
-            st.rerun()
+        # Currency & Travel or Food order follow-ups, depending on the last agent used
+        followups = FOLLOWUP_MAP.get(st.session_state.get("last_agent_type"))
+        if followups:
+            for col, (label, task) in zip(st.columns(len(followups)), followups):
+                if col.button(label, use_container_width=True):
+                    st.session_state["task_description"] = task
         
         st.markdown("---")
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Use quick_task if button was clicked, otherwise keep the existing value
-        default_value = quick_task if quick_task else ""
-        if "task_input_value" not in st.session_state:
-            st.session_state.task_input_value = default_value
-        if quick_task:
-            st.session_state.task_input_value = quick_task
-            
         task_input = st.text_area(
             "Task Description",
-            value=st.session_state.task_input_value,
             placeholder="Example: Create an illustration of a soccer stadium at sunset",
             height=100,
             key="task_description"
@@ -279,14 +373,14 @@ elif page == "📝 Submit Task":
                 if preferred_agent:
                     payload["preferred_agent"] = preferred_agent
                 
-                response = requests.post(
+                response = get_session().post(
                     f"{orchestrator_url}{endpoint}",
                     json=payload,
-                    timeout=30
+                    timeout=(2.0, 28.0)
                 )
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = json_loads(response.content)
                     
                     st.markdown("<div class='success-box'>", unsafe_allow_html=True)
                     st.success("✅ Task submitted successfully!")
@@ -306,19 +400,15 @@ elif page == "📝 Submit Task":
                             formatted_response = parse_agent_response(result["result"], agent_used)
                             
                             # Display with appropriate icon
-                            if "burger" in agent_used.lower():
-                                st.success(f"🍔 **{formatted_response}**")
-                                st.session_state.last_agent_type = "burger"
-                            elif "pizza" in agent_used.lower():
-                                st.success(f"🍕 **{formatted_response}**")
-                                st.session_state.last_agent_type = "pizza"
-                            elif "travel" in agent_used.lower():
+                            agent_match = AGENT_TYPE_RE.search(agent_used)
+                            agent_type = agent_match.group(1).lower() if agent_match else "other"
+                            if agent_type in FOOD_ICONS:
+                                st.success(f"{FOOD_ICONS[agent_type]} **{formatted_response}**")
+                                st.session_state.last_agent_type = agent_type
+                            elif agent_type == "travel":
                                 st.info(formatted_response)
                                 # Determine if it's currency or trip planning
-                                if "convert" in task_input.lower() or "exchange" in task_input.lower() or "usd" in task_input.lower() or "eur" in task_input.lower():
-                                    st.session_state.last_agent_type = "currency"
-                                else:
-                                    st.session_state.last_agent_type = "travel"
+                                st.session_state.last_agent_type = "currency" if CURRENCY_RE.search(task_input) else "travel"
                             else:
                                 st.info(formatted_response)
                                 st.session_state.last_agent_type = "other"
@@ -384,37 +474,56 @@ elif page == "🔍 Async Responses":
     with col2:
         max_msgs = st.number_input("Max messages:", min_value=1, max_value=50, value=10)
     
-    if st.button("🔄 Fetch Responses", use_container_width=True, type="primary"):
+    # Responses stay in the queue (they are only peeked), so each fetch continues
+    # from where the previous one stopped for this user filter
+    cursors = st.session_state.setdefault("response_cursors", {})
+    
+    col_fetch, col_reset = st.columns([3, 1])
+    with col_fetch:
+        fetch_clicked = st.button("🔄 Fetch Responses", use_container_width=True, type="primary")
+    with col_reset:
+        if st.button("⏮️ From Oldest", use_container_width=True):
+            cursors.pop(user_filter, None)
+    
+    if fetch_clicked:
         with st.spinner("Fetching responses from Service Bus..."):
             try:
-                response = requests.get(
+                response = get_session().get(
                     f"{orchestrator_url}/responses/{user_filter}",
-                    params={"max_messages": max_msgs},
-                    timeout=10
+                    params={"max_messages": max_msgs, "from_sequence": cursors.get(user_filter, 0)},
+                    timeout=(1.0, 9.0)
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = parse_body(response.content)
                     total = data.get("total", 0)
                     responses = data.get("responses", [])
+                    cursors[user_filter] = data.get("next_sequence", 0)
+                    
+                    if data.get("more_available"):
+                        st.caption("➡️ More responses are queued - fetch again to continue")
                     
                     if total > 0:
                         st.success(f"✅ Found {total} response(s)")
                         
-                        for idx, resp in enumerate(responses, 1):
-                            with st.expander(f"📬 Response {idx}/{total} - {resp.get('user_id', 'unknown')}", expanded=True):
-                                col_a, col_b = st.columns(2)
-                                with col_a:
-                                    st.caption(f"👤 User: {resp.get('user_id', 'N/A')}")
-                                    st.caption(f"🤖 Agent: {resp.get('agent_used', 'N/A')}")
-                                with col_b:
-                                    st.caption(f"🕐 Time: {resp.get('timestamp', 'N/A')}")
-                                    st.caption(f"🆔 Message: {resp.get('message_id', 'N/A')}")
-                                
-                                st.markdown("**Response:**")
-                                st.info(resp.get('response', 'No response'))
+                        rows = [
+                            (
+                                r.get("user_id", "N/A"),
+                                r.get("agent_used", "N/A"),
+                                r.get("timestamp", "N/A"),
+                                r.get("message_id", "N/A"),
+                                r.get("response", "No response"),
+                            )
+                            for r in responses
+                        ]
+                        for idx, row in enumerate(rows, 1):
+                            with st.expander(f"📬 Response {idx}/{total} - {row[0]}", expanded=True):
+                                # Metadata as one element; the body stays in st.info so
+                                # agent Markdown renders the same as on the sync page
+                                st.markdown(render_response_meta(*row[:4]), unsafe_allow_html=True)
+                                st.info(row[4])
                     else:
-                        st.warning("📭 No responses found in the queue")
+                        st.warning("📭 No new responses found in the queue")
                 else:
                     st.error(f"❌ Error: {response.status_code}")
                     st.code(response.text)
@@ -437,13 +546,7 @@ elif page == "🔍 Async Responses":
     """)
     
     with st.expander("📋 Sample Response Format"):
-        st.json({
-            "task_id": "abc123",
-            "user_id": "streamlit-user",
-            "result": "100 USD is approximately 86.42 EUR",
-            "timestamp": datetime.now().isoformat(),
-            "agent_used": "travel_agent"
-        })
+        st.json(SAMPLE_RESPONSE)
 
 # Footer
 st.markdown("---")